@@ -6,40 +6,228 @@ Extracts partitions and configuration files from Allwinner firmware images.
 Based on linux-sunxi documentation and awimage specifications.
 """
 
+import io
+import mmap
+import re
 import struct
 import os
 import sys
+import time
+import zipfile
+from contextlib import contextmanager
 from pathlib import Path
 
+# Precompiled little-endian field readers; unpack_from reads in place
+# instead of slicing a temporary bytes object for every field.
+_U32 = struct.Struct('<I').unpack_from
+# Android boot header fields following the 8-byte magic: kernel size/addr,
+# ramdisk size/addr, second size/addr, tags addr, page size
+_BOOT_HDR = struct.Struct('<8I')
+_BOOT_MAGIC_SIZE = 8
+# IMAGEWTY item headers, one 1024-byte record per item after the image
+# header. Both start with filename length, header size, main type and sub
+# type; v1 then has unknown, stored length, original length, offset,
+# unknown, filename while v3 has unknown, filename, stored length, pad,
+# original length, pad, offset.
+_ITEM_V1 = struct.Struct('<II8s16sIIIII256s')
+_ITEM_V3 = struct.Struct('<II8s16sI256sIIIII')
+# Bytes replaced in item names so they are safe to use as file names
+_UNPRINTABLE = re.compile(rb'[^\x20-\x7e]')
+
+
+def _item_name(raw):
+    """Output file name for a packed item name, or '' if nothing usable."""
+    name = _UNPRINTABLE.sub(b'_', raw).decode('ascii')
+    # Packed names may carry a host path; keep only the file name
+    name = name.replace('\\', '/').rsplit('/', 1)[-1]
+    return '' if name in ('.', '..') else name
+
+
+def _is_boot_header(data, offset):
+    """Tell a real boot image header from a stray 'ANDROID!' string.
+
+    Magics are matched at any alignment, so text or C strings can hit.
+    mkbootimg always writes a kernel and a page size, and the header page
+    has to fit in the image.
+    """
+    if offset + _BOOT_MAGIC_SIZE + _BOOT_HDR.size > len(data):
+        return False
+    kernel_size, _, _, _, _, _, _, page_size = \
+        _BOOT_HDR.unpack_from(data, offset + _BOOT_MAGIC_SIZE)
+    if page_size & (page_size - 1) or not 2048 <= page_size <= 16384:
+        return False
+    return kernel_size > 0 and offset + page_size <= len(data)
+
+
+@contextmanager
+def _map_image(f):
+    """Map an open image read-only; mmap rejects empty files, so those
+    yield b'' instead."""
+    if os.fstat(f.fileno()).st_size == 0:
+        yield b''
+        return
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        # Let the kernel page the image in on demand with readahead
+        # rather than copying the whole firmware into a bytes object.
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            data.madvise(mmap.MADV_SEQUENTIAL)
+        yield data
+
 class AWImageExtractor:
     """Extract Allwinner IMAGEWTY format firmware images."""
 
     MAGIC_IMAGEWTY = b'IMAGEWTY'
+    MAGIC_ANDROID_BOOT = b'ANDROID!'
+    MAGIC_SPARSE = b'\x3a\xff\x26\xed'
+    MAGIC_UBOOT = b'U-Boot '
+    MAGIC_KERNEL = b'Linux version'
+    MAGIC_ANDROID_RELEASE = b'ro.build.version.release='
     HEADER_SIZE = 0x400  # 1024 bytes
+    ITEM_SIZE = 0x400  # 1024 bytes per item header
+    HEADER_VERSION_3 = 0x300
+
+    # Every magic the extractor looks for, located in a single pass
+    SIGNATURES = re.compile(b'|'.join(map(re.escape, [
+        MAGIC_ANDROID_BOOT, MAGIC_SPARSE, MAGIC_UBOOT, MAGIC_KERNEL,
+        MAGIC_ANDROID_RELEASE,
+    ])))
+
+    # FEX section markers that start a sys_config, matched in a single pass;
+    # configs are still numbered marker by marker in this order
+    FEX_MARKER_ORDER = (b'[product]', b'[platform]', b'[target]')
+    FEX_MARKERS = re.compile(b'|'.join(map(re.escape, FEX_MARKER_ORDER)))
+    # Candidate padding run marking the end of an embedded text config
+    FEX_PADDING = re.compile(rb'\x00{4}|\xff{4}')
 
-    def __init__(self, image_path, output_dir):
+    ARCHIVE_NAME = 'extracted.zip'
+
+    def __init__(self, image_path, output_dir, archive=False):
         self.image_path = Path(image_path)
         self.output_dir = Path(output_dir)
         self.items = []
+        # Store every output in one uncompressed zip instead of loose files
+        self.archive = archive
+        self.zip = None
+
+    @contextmanager
+    def _open_archive(self):
+        """Hold the output archive open for the duration of an extraction."""
+        if not self.archive:
+            yield
+            return
+        try:
+            with zipfile.ZipFile(self.output_dir / self.ARCHIVE_NAME, 'w',
+                                 zipfile.ZIP_STORED) as self.zip:
+                yield
+        finally:
+            self.zip = None
+
+    def _output_path(self, name):
+        """Path an output is reported under (inside the archive if enabled)."""
+        if self.zip is not None:
+            return self.output_dir / self.ARCHIVE_NAME / name
+        return self.output_dir / name
+
+    @contextmanager
+    def _open_output(self, name, mode='wb'):
+        """Open an output file for writing, as an archive member if enabled."""
+        if self.zip is None:
+            with open(self.output_dir / name, mode) as f:
+                yield f
+            return
+        info = zipfile.ZipInfo(name, time.localtime()[:6])
+        with self.zip.open(info, 'w', force_zip64=True) as f:
+            if 'b' in mode:
+                yield f
+            else:
+                with io.TextIOWrapper(f) as text:
+                    yield text
 
     def read_header(self, data):
         """Parse IMAGEWTY header."""
         if data[:8] != self.MAGIC_IMAGEWTY:
             raise ValueError("Not a valid IMAGEWTY image")
 
+        header_version = _U32(data, 8)[0]
+
         # Header structure (simplified)
         header = {
             'magic': data[:8],
-            'header_version': struct.unpack('<I', data[8:12])[0],
-            'header_size': struct.unpack('<I', data[12:16])[0],
-            'image_size': struct.unpack('<I', data[16:20])[0],
-            'item_count': struct.unpack('<I', data[0x38:0x3C])[0],
+            'header_version': header_version,
+            'header_size': _U32(data, 12)[0],
+            'image_size': _U32(data, 16)[0],
+            # v3 headers carry an extra word before the ids
+            'item_count': _U32(data, 0x3C if header_version == self.HEADER_VERSION_3 else 0x38)[0],
         }
         return header
 
-    def find_partitions(self, data):
+    def read_items(self, data, header):
+        """Parse the IMAGEWTY item table, or return [] if it is not plausible."""
+        count = header['item_count']
+        if not 0 < count <= 1024 or self.HEADER_SIZE + count * self.ITEM_SIZE > len(data):
+            return []
+
+        items = []
+        seen = set()
+        for i in range(count):
+            pos = self.HEADER_SIZE + i * self.ITEM_SIZE
+            if header['header_version'] == self.HEADER_VERSION_3:
+                (_, item_header_size, main_type, sub_type, _, filename,
+                 stored_length, _, original_length, _, offset) = _ITEM_V3.unpack_from(data, pos)
+            else:
+                (_, item_header_size, main_type, sub_type, _, stored_length,
+                 original_length, offset, _, filename) = _ITEM_V1.unpack_from(data, pos)
+
+            if item_header_size != self.ITEM_SIZE or offset < self.HEADER_SIZE \
+                    or offset + stored_length > len(data) or original_length > stored_length:
+                return []
+
+            name = _item_name(filename.split(b'\x00', 1)[0]) or \
+                _item_name((main_type + b'_' + sub_type).replace(b'\x00', b'').strip()) or \
+                f'item_{i}'
+            # A repeated name gets the item offset, as later boot images do,
+            # so it neither overwrites nor duplicates an earlier output
+            if name in seen:
+                stem, ext = os.path.splitext(name)
+                name = f'{stem}_{offset:08x}{ext}'
+            seen.add(name)
+
+            items.append({
+                'name': name,
+                'main_type': main_type.rstrip(b'\x00 ').decode('ascii', errors='replace'),
+                'sub_type': sub_type.rstrip(b'\x00 ').decode('ascii', errors='replace'),
+                'offset': offset,
+                'size': original_length,
+            })
+
+        return items
+
+    def extract_items(self, data):
+        """Write every item from the parsed table, without scanning."""
+        if self.zip is None:
+            (self.output_dir / 'items').mkdir(exist_ok=True)
+
+        with memoryview(data) as view:
+            for item in self.items:
+                print(f"Found: {item['name']} ({item['main_type']}/{item['sub_type']}) "
+                      f"at offset 0x{item['offset']:08x} ({item['size']:,} bytes)")
+                name = f"items/{item['name']}"
+                with self._open_output(name) as f:
+                    f.write(view[item['offset']:item['offset']+item['size']])
+                print(f"Saved: {self._output_path(name)}")
+
+    def scan_signatures(self, data):
+        """Map each known magic to the offsets it occurs at, in one pass."""
+        hits = {}
+        for match in self.SIGNATURES.finditer(data):
+            hits.setdefault(match.group(), []).append(match.start())
+        return hits
+
+    def find_partitions(self, data, hits=None):
         """Find partition data in image by searching for known signatures."""
         partitions = []
+        if hits is None:
+            hits = self.scan_signatures(data)
 
         # Search for known partition signatures
         signatures = {
@@ -54,96 +242,84 @@ class AWImageExtractor:
         # Search for FEX configuration
         fex_markers = [b'[product]', b'[platform]', b'[target]', b'[power_sply]']
 
-        offset = 0
-        while offset < len(data):
-            # Look for boot.img
-            if data[offset:offset+8] == b'ANDROID!':
-                # Parse Android boot image header
-                kernel_size = struct.unpack('<I', data[offset+8:offset+12])[0]
-                ramdisk_size = struct.unpack('<I', data[offset+16:offset+20])[0]
-                page_size = struct.unpack('<I', data[offset+36:offset+40])[0]
-                if page_size == 0:
-                    page_size = 2048
-
-                # Calculate total size
-                total_size = page_size  # header
-                total_size += ((kernel_size + page_size - 1) // page_size) * page_size
-                total_size += ((ramdisk_size + page_size - 1) // page_size) * page_size
-
-                partitions.append({
-                    'type': 'boot.img',
-                    'offset': offset,
-                    'size': min(total_size, 64*1024*1024),  # Max 64MB
-                    'name': 'boot.img'
-                })
-
-            # Look for sparse images (system, vendor, etc.)
-            if data[offset:offset+4] == b'\x3a\xff\x26\xed':
-                # Sparse image magic
-                partitions.append({
-                    'type': 'sparse',
-                    'offset': offset,
-                    'size': 0,  # Will determine later
-                    'name': f'sparse_{offset:08x}.img'
-                })
-
-            offset += 512  # Search every 512 bytes
-
+        # Look for boot.img
+        for offset in hits.get(self.MAGIC_ANDROID_BOOT, []):
+            if not _is_boot_header(data, offset):
+                continue
+
+            # Parse Android boot image header
+            kernel_size, _, ramdisk_size, _, _, _, _, page_size = \
+                _BOOT_HDR.unpack_from(data, offset + _BOOT_MAGIC_SIZE)
+
+            # Calculate total size
+            total_size = page_size  # header
+            total_size += ((kernel_size + page_size - 1) // page_size) * page_size
+            total_size += ((ramdisk_size + page_size - 1) // page_size) * page_size
+
+            partitions.append({
+                'type': 'boot.img',
+                'offset': offset,
+                'size': min(total_size, 64*1024*1024),  # Max 64MB
+                # Keep the first image as boot.img; nested or later ones
+                # must not overwrite it
+                'name': 'boot.img' if not partitions else f'boot_{offset:08x}.img'
+            })
+
+        # Look for sparse images (system, vendor, etc.)
+        for offset in hits.get(self.MAGIC_SPARSE, []):
+            # Sparse image magic
+            partitions.append({
+                'type': 'sparse',
+                'offset': offset,
+                'size': 0,  # Will determine later
+                'name': f'sparse_{offset:08x}.img'
+            })
+
+        partitions.sort(key=lambda p: p['offset'])
         return partitions
 
     def extract_strings(self, data, min_length=20):
         """Extract readable strings for analysis."""
-        strings = []
-        current = b''
-
-        for byte in data:
-            if 32 <= byte < 127:
-                current += bytes([byte])
-            else:
-                if len(current) >= min_length:
-                    try:
-                        strings.append(current.decode('ascii'))
-                    except:
-                        pass
-                current = b''
-
-        return strings
+        # One C-level pass over the buffer; the character class already
+        # guarantees the matches are plain ASCII.
+        pattern = re.compile(rb'[\x20-\x7e]{%d,}' % min_length)
+        return [m.group().decode('ascii') for m in pattern.finditer(data)]
 
     def extract_fex_configs(self, data):
         """Extract .fex configuration files."""
         configs = []
 
-        # Look for FEX file markers
-        markers = [b'[product]', b'[platform]', b'[target]']
-
-        for marker in markers:
-            offset = 0
-            while True:
-                pos = data.find(marker, offset)
-                if pos == -1:
+        # Each marker is only searched again past the end of the config it
+        # last produced, as when the markers were scanned one at a time.
+        next_offset = {}
+
+        for match in self.FEX_MARKERS.finditer(data):
+            pos = match.start()
+            if pos < next_offset.get(match.group(), 0):
+                continue
+
+            # Find the end of the config (next binary data or EOF)
+            limit = min(len(data), pos + 100000)
+            end = limit
+            pad = self.FEX_PADDING.search(data, pos, limit + 3)
+            while pad and pad.start() < limit:
+                window = data[pad.start():pad.start()+16]
+                if window.count(0) + window.count(0xff) > 8:
+                    end = pad.start()
                     break
+                pad = self.FEX_PADDING.search(data, pad.start() + 1, limit + 3)
+
+            if end > pos + 100:  # Minimum valid config size
+                configs.append({
+                    'marker': match.group(),
+                    'offset': pos,
+                    'size': end - pos,
+                    'data': data[pos:end]
+                })
 
-                # Find the end of the config (next binary data or EOF)
-                end = pos
-                while end < len(data) and end - pos < 100000:
-                    if data[end:end+4] in [b'\x00\x00\x00\x00', b'\xff\xff\xff\xff']:
-                        consecutive_nulls = 0
-                        for i in range(min(16, len(data) - end)):
-                            if data[end+i] == 0 or data[end+i] == 0xff:
-                                consecutive_nulls += 1
-                        if consecutive_nulls > 8:
-                            break
-                    end += 1
-
-                if end > pos + 100:  # Minimum valid config size
-                    configs.append({
-                        'offset': pos,
-                        'size': end - pos,
-                        'data': data[pos:end]
-                    })
-
-                offset = end
+            next_offset[match.group()] = end
 
+        configs.sort(key=lambda c: (self.FEX_MARKER_ORDER.index(c['marker']), c['offset']))
         return configs
 
     def extract(self):
@@ -153,85 +329,104 @@ class AWImageExtractor:
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        with open(self.image_path, 'rb') as f:
-            data = f.read()
-
-        print(f"Image size: {len(data):,} bytes ({len(data)/1024/1024:.1f} MB)")
-
-        # Parse header
-        try:
-            header = self.read_header(data)
-            print(f"Header version: {header['header_version']}")
-            print(f"Item count: {header['item_count']}")
-        except ValueError as e:
-            print(f"Warning: {e}")
-
-        # Extract build properties
-        print("\n=== Extracting build.prop ===")
-        build_prop_start = data.find(b'ro.build.id=')
-        if build_prop_start != -1:
-            # Find reasonable end
-            build_prop_end = build_prop_start
-            while build_prop_end < len(data) and build_prop_end - build_prop_start < 10000:
-                if data[build_prop_end:build_prop_end+2] == b'\x00\x00':
-                    break
-                build_prop_end += 1
-
-            build_prop = data[build_prop_start:build_prop_end]
-            # Clean up
-            build_prop = build_prop.replace(b'\x00', b'\n')
-
-            build_prop_path = self.output_dir / 'build.prop'
-            with open(build_prop_path, 'wb') as f:
-                f.write(build_prop)
-            print(f"Saved: {build_prop_path}")
-
-        # Extract FEX configurations
-        print("\n=== Extracting FEX configs ===")
-        configs = self.extract_fex_configs(data)
-        for i, config in enumerate(configs):
-            config_path = self.output_dir / f'sys_config_{i}.fex'
-            with open(config_path, 'wb') as f:
-                f.write(config['data'])
-            print(f"Saved: {config_path} ({config['size']} bytes)")
-
-        # Find and list partitions
-        print("\n=== Searching for partitions ===")
-        partitions = self.find_partitions(data)
-        for part in partitions:
-            print(f"Found: {part['type']} at offset 0x{part['offset']:08x}")
-
-            if part['type'] == 'boot.img' and part['size'] > 0:
-                boot_path = self.output_dir / 'boot.img'
-                with open(boot_path, 'wb') as f:
-                    f.write(data[part['offset']:part['offset']+part['size']])
-                print(f"Saved: {boot_path}")
-
-        # Extract important strings for analysis
-        print("\n=== Extracting version info ===")
-        version_strings = []
-        for s in self.extract_strings(data, 30):
-            if any(x in s.lower() for x in ['version', 'android', 'kernel', 'mali', 'allwinner', 'build']):
-                version_strings.append(s)
-
-        info_path = self.output_dir / 'image_info.txt'
-        with open(info_path, 'w') as f:
-            f.write("=== Allwinner Image Analysis ===\n\n")
-            f.write(f"Source: {self.image_path.name}\n")
-            f.write(f"Size: {len(data):,} bytes\n\n")
-            f.write("=== Version Strings ===\n")
-            for s in sorted(set(version_strings))[:100]:
-                f.write(f"{s}\n")
-        print(f"Saved: {info_path}")
-
-        # Create partition map
-        print("\n=== Creating partition analysis ===")
-        self.analyze_image_structure(data)
+        with open(self.image_path, 'rb') as img, _map_image(img) as data, \
+                self._open_archive():
+            print(f"Image size: {len(data):,} bytes ({len(data)/1024/1024:.1f} MB)")
+
+            # Parse header
+            header = None
+            try:
+                header = self.read_header(data)
+                print(f"Header version: {header['header_version']}")
+                print(f"Item count: {header['item_count']}")
+            except ValueError as e:
+                print(f"Warning: {e}")
+
+            # Extract build properties
+            print("\n=== Extracting build.prop ===")
+            build_prop_start = data.find(b'ro.build.id=')
+            if build_prop_start != -1:
+                # Find reasonable end: first double null within 10000 bytes
+                limit = min(len(data), build_prop_start + 10000)
+                build_prop_end = data.find(b'\x00\x00', build_prop_start, limit + 1)
+                if build_prop_end == -1:
+                    build_prop_end = limit
+
+                build_prop = data[build_prop_start:build_prop_end]
+                # Clean up
+                build_prop = build_prop.replace(b'\x00', b'\n')
+
+                build_prop_path = self._output_path('build.prop')
+                with self._open_output('build.prop') as f:
+                    f.write(build_prop)
+                print(f"Saved: {build_prop_path}")
+
+            # Extract FEX configurations
+            print("\n=== Extracting FEX configs ===")
+            configs = self.extract_fex_configs(data)
+            for i, config in enumerate(configs):
+                config_name = f'sys_config_{i}.fex'
+                config_path = self._output_path(config_name)
+                with self._open_output(config_name) as f:
+                    f.write(config['data'])
+                print(f"Saved: {config_path} ({config['size']} bytes)")
+
+            hits = None
+            if header is not None:
+                self.items = self.read_items(data, header)
+
+            if self.items:
+                # A valid item table gives exact offsets and sizes, so the
+                # signature heuristics are not needed for partitions
+                print("\n=== Extracting items ===")
+                self.extract_items(data)
+            else:
+                # Find and list partitions
+                print("\n=== Searching for partitions ===")
+                hits = self.scan_signatures(data)
+                partitions = self.find_partitions(data, hits)
+                for part in partitions:
+                    print(f"Found: {part['type']} at offset 0x{part['offset']:08x}")
+
+                    if part['type'] == 'boot.img' and part['size'] > 0:
+                        boot_path = self._output_path(part['name'])
+                        # Write straight from the map rather than copying the
+                        # partition into a temporary bytes object first
+                        with self._open_output(part['name']) as f, memoryview(data) as view:
+                            f.write(view[part['offset']:part['offset']+part['size']])
+                        print(f"Saved: {boot_path}")
+
+            # Extract important strings for analysis
+            print("\n=== Extracting version info ===")
+            version_strings = []
+            for s in self.extract_strings(data, 30):
+                if any(x in s.lower() for x in ['version', 'android', 'kernel', 'mali', 'allwinner', 'build']):
+                    version_strings.append(s)
+
+            info_path = self._output_path('image_info.txt')
+            with self._open_output('image_info.txt', 'w') as f:
+                f.write("=== Allwinner Image Analysis ===\n\n")
+                f.write(f"Source: {self.image_path.name}\n")
+                f.write(f"Size: {len(data):,} bytes\n\n")
+                f.write("=== Version Strings ===\n")
+                f.writelines(f"{s}\n" for s in sorted(set(version_strings))[:100])
+            print(f"Saved: {info_path}")
+
+            # Create partition map
+            print("\n=== Creating partition analysis ===")
+            self.analyze_image_structure(data, hits)
 
         return True
 
-    def analyze_image_structure(self, data):
+    def analyze_image_structure(self, data, hits=None):
         """Analyze and document image structure."""
+        def first(magic):
+            # Without a prior full scan only the first hit of each magic is
+            # needed, and find stops there
+            if hits is None:
+                return data.find(magic)
+            return hits.get(magic, [-1])[0]
+
         analysis = []
         analysis.append("=== Allwinner Image Structure Analysis ===\n")
 
@@ -240,7 +435,7 @@ class AWImageExtractor:
 
         # Search for u-boot
         null_byte = b'\x00'
-        uboot_offset = data.find(b'U-Boot ')
+        uboot_offset = first(self.MAGIC_UBOOT)
         if uboot_offset != -1:
             uboot_version = data[uboot_offset:uboot_offset+50]
             version_str = uboot_version.split(null_byte)[0].decode('ascii', errors='ignore')
@@ -248,7 +443,7 @@ class AWImageExtractor:
             analysis.append(f"Version: {version_str}\n")
 
         # Search for kernel
-        kernel_offset = data.find(b'Linux version')
+        kernel_offset = first(self.MAGIC_KERNEL)
         if kernel_offset != -1:
             kernel_version = data[kernel_offset:kernel_offset+100]
             version_str = kernel_version.split(null_byte)[0].decode('ascii', errors='ignore')
@@ -256,7 +451,7 @@ class AWImageExtractor:
             analysis.append(f"Version: {version_str}\n")
 
         # Search for Android info
-        android_offset = data.find(b'ro.build.version.release=')
+        android_offset = first(self.MAGIC_ANDROID_RELEASE)
         if android_offset != -1:
             version = data[android_offset:android_offset+50]
             version_str = version.split(null_byte)[0].decode('ascii', errors='ignore')
@@ -264,22 +459,24 @@ class AWImageExtractor:
             analysis.append(f"{version_str}\n")
 
         # Save analysis
-        analysis_path = self.output_dir / 'structure_analysis.txt'
-        with open(analysis_path, 'w') as f:
+        analysis_path = self._output_path('structure_analysis.txt')
+        with self._open_output('structure_analysis.txt', 'w') as f:
             f.write('\n'.join(analysis))
         print(f"Saved: {analysis_path}")
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: awimage_extract.py <image.img> [output_dir]")
+    args = [arg for arg in sys.argv[1:] if arg != '--zip']
+    if len(args) < 1:
+        print("Usage: awimage_extract.py [--zip] <image.img> [output_dir]")
         print("\nExtracts partitions and configs from Allwinner IMAGEWTY firmware.")
+        print("With --zip, outputs are stored in output_dir/extracted.zip.")
         sys.exit(1)
 
-    image_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else './extracted'
+    image_path = args[0]
+    output_dir = args[1] if len(args) > 1 else './extracted'
 
-    extractor = AWImageExtractor(image_path, output_dir)
+    extractor = AWImageExtractor(image_path, output_dir, archive='--zip' in sys.argv[1:])
     extractor.extract()
     print("\nExtraction complete!")
 
@@ -2,15 +2,150 @@
 """
 Allwinner IMAGEWTY Full Extractor
 Extracts all partitions and blobs from Allwinner firmware images.
+
+Installing python-hyperscan (optional) speeds up the signature scans.
 """
 
+import io
+import mmap
+import re
 import struct
 import os
 import sys
+import threading
+import time
+import zipfile
 import zlib
 import lzma
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
+try:
+    import hyperscan
+except ImportError:  # Optional; LiteralScanner falls back to the re module
+    hyperscan = None
+
+# Precompiled little-endian field reader; unpack_from reads in place
+# instead of slicing a temporary bytes object for every field.
+_U16 = struct.Struct('<H').unpack_from
+# Android boot header fields following the 8-byte magic: kernel size/addr,
+# ramdisk size/addr, second size/addr, tags addr, page size
+_BOOT_HDR = struct.Struct('<8I')
+_BOOT_MAGIC_SIZE = 8
+# Sparse header fields following the magic and version: header size,
+# chunk header size, block size, total blocks, total chunks
+_SPARSE_HDR = struct.Struct('<HHIII')
+_SPARSE_HDR_OFFSET = 8
+# ELF section header table location: e_shoff, skipping e_flags/e_ehsize/
+# e_phentsize/e_phnum, then e_shentsize and e_shnum
+_ELF32_SH = struct.Struct('<I10xHH')
+_ELF32_SH_OFFSET = 32
+_ELF64_SH = struct.Struct('<Q10xHH')
+_ELF64_SH_OFFSET = 40
+
+
+def _is_boot_header(data, offset):
+    """Tell a real boot image header from a stray 'ANDROID!' string.
+
+    Magics are matched at any alignment, so text or C strings can hit.
+    mkbootimg always writes a kernel and a page size, and the header page
+    has to fit in the image.
+    """
+    if offset + _BOOT_MAGIC_SIZE + _BOOT_HDR.size > len(data):
+        return False
+    kernel_size, _, _, _, _, _, _, page_size = \
+        _BOOT_HDR.unpack_from(data, offset + _BOOT_MAGIC_SIZE)
+    if page_size & (page_size - 1) or not 2048 <= page_size <= 16384:
+        return False
+    return kernel_size > 0 and offset + page_size <= len(data)
+
+
+# Per-thread line buffer used while an extraction step runs in the pool
+_log_buffer = threading.local()
+
+
+def _log(*args, **kwargs):
+    """print(), or buffer the line when called from a pooled worker task."""
+    lines = getattr(_log_buffer, 'lines', None)
+    if lines is None:
+        print(*args, **kwargs)
+    else:
+        lines.append((args, kwargs))
+
+
+def _run_buffered(task):
+    """Run task and return the lines it logged instead of printing them."""
+    _log_buffer.lines = lines = []
+    try:
+        task()
+    finally:
+        _log_buffer.lines = None
+    return lines
+
+
+class LiteralScanner:
+    """Find every occurrence of a fixed set of byte strings in one pass.
+
+    Uses a Hyperscan streaming database when python-hyperscan is installed,
+    otherwise a compiled re alternation.
+    """
+
+    CHUNK_SIZE = 16 * 1024 * 1024
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.regex = re.compile(b'|'.join(map(re.escape, self.patterns)))
+        # Built on first use so importing the module never pays for, or
+        # fails on, a Hyperscan compile
+        self.db = None
+        self._db_built = False
+
+    def _database(self):
+        """Return the Hyperscan database, or None to scan with re."""
+        if not self._db_built:
+            self._db_built = True
+            if hyperscan is not None:
+                db = hyperscan.Database(mode=hyperscan.HS_MODE_STREAM)
+                try:
+                    db.compile(
+                        # Every byte as \xHH, so magics with NULs or
+                        # metacharacters stay literal
+                        expressions=[b''.join(b'\\x%02x' % c for c in p) for p in self.patterns],
+                        ids=list(range(len(self.patterns))),
+                        flags=0,
+                    )
+                    self.db = db
+                except hyperscan.error as e:
+                    _log(f"Warning: Hyperscan compile failed, using re: {e}")
+        return self.db
+
+    def finditer(self, data):
+        """Yield (offset, pattern) for each match in data."""
+        db = self._database()
+        if db is None:
+            for match in self.regex.finditer(data):
+                yield match.start(), match.group()
+            return
+
+        found = []
+
+        def on_match(pattern_id, start, end, flags, context):
+            pattern = self.patterns[pattern_id]
+            found.append((end - len(pattern), pattern))
+
+        # Feed the map through a stream in chunks; matches spanning a chunk
+        # boundary are still reported, at absolute offsets
+        with db.stream(match_event_handler=on_match) as stream, \
+                memoryview(data) as view:
+            for chunk_start in range(0, len(view), self.CHUNK_SIZE):
+                stream.scan(view[chunk_start:chunk_start+self.CHUNK_SIZE])
+                yield from found
+                found.clear()
+        yield from found
+
+
 class AllwinnerImageExtractor:
     """Full extraction of Allwinner IMAGEWTY firmware."""
 
@@ -20,64 +155,185 @@ class AllwinnerImageExtractor:
     MAGIC_EXT4 = b'\x53\xef'
     MAGIC_GZIP = b'\x1f\x8b'
     MAGIC_LZMA = b'\x5d\x00\x00'
-
-    def __init__(self, image_path, output_dir):
+    MAGIC_ELF = b'\x7fELF'
+    # GZIP plus the deflate method byte; the bare 2-byte magic matches far
+    # too often at arbitrary alignment
+    MAGIC_GZIP_DEFLATE = MAGIC_GZIP + b'\x08'
+
+    # FEX section markers that start a sys_config, matched in a single pass;
+    # configs are still numbered marker by marker in this order
+    FEX_MARKER_ORDER = (b'[product]', b'[platform]', b'[target]')
+    FEX_MARKERS = re.compile(b'|'.join(map(re.escape, FEX_MARKER_ORDER)))
+
+    # Library names looked for near an ELF header, in priority order
+    LIB_NAMES = [
+        b'libGLES_mali.so',
+        b'libMali.so',
+        b'libUMP.so',
+        b'gralloc.sun8i.so',
+        b'gralloc.sun50i.so',
+        b'hwcomposer.sun8i.so',
+        b'hwcomposer.sun50i.so',
+        b'libcedarc.so',
+        b'libcedarx.so',
+        b'libcdc_base.so',
+        b'libcdc_vd_h264.so',
+        b'libcdc_vd_h265.so',
+        b'libcdc_vd_mpeg2.so',
+        b'libcdc_vd_mpeg4.so',
+        b'libVE.so',
+        b'libMemAdapter.so',
+        b'libvdecoder.so',
+        b'libvencoder.so',
+        b'audio.primary.sun8i.so',
+    ]
+
+    # Every magic and library name the scanners look for, located in a
+    # single pass
+    SIGNATURES = LiteralScanner([
+        MAGIC_ANDROID_BOOT, MAGIC_SPARSE, MAGIC_GZIP_DEFLATE, MAGIC_ELF,
+    ] + LIB_NAMES)
+
+    # WiFi firmware patterns
+    FIRMWARE_PATTERNS = [
+        (b'xr829', 'xr829.bin'),
+        (b'rtl8189', 'rtl8189ftv_fw.bin'),
+        (b'rtl8723', 'rtl8723bs_fw.bin'),
+        (b'BCM4', 'bcm_wifi.bin'),
+        (b'brcmfmac', 'brcmfmac.bin'),
+    ]
+    FIRMWARE_SCANNER = LiteralScanner(p for p, _ in FIRMWARE_PATTERNS)
+
+    ARCHIVE_NAME = 'extracted.zip'
+
+    def __init__(self, image_path, output_dir, archive=False):
         self.image_path = Path(image_path)
         self.output_dir = Path(output_dir)
         self.data = None
+        # Store every output in one uncompressed zip instead of loose files
+        self.archive = archive
+        self.zip = None
+        self._zip_lock = threading.Lock()
+        self.hits = None
+        self.lib_name_hits = None
+        self.lib_name_offsets = None
 
     def read_image(self):
-        """Read entire image into memory."""
+        """Map the image read-only; pages are faulted in as they are scanned."""
         print(f"Reading image: {self.image_path}")
         with open(self.image_path, 'rb') as f:
-            self.data = f.read()
+            # mmap rejects empty files; b'' supports the same reads
+            if os.fstat(f.fileno()).st_size == 0:
+                self.data = b''
+            else:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if isinstance(self.data, mmap.mmap) and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self.data.madvise(mmap.MADV_SEQUENTIAL)
         print(f"Image size: {len(self.data):,} bytes ({len(self.data)/1024/1024:.1f} MB)")
 
+    def scan_signatures(self):
+        """Map each known magic to the offsets it occurs at, in one pass."""
+        if self.hits is None:
+            self.hits = {}
+            for pos, magic in self.SIGNATURES.finditer(self.data):
+                self.hits.setdefault(magic, []).append(pos)
+
+            # Library names by position, for pairing with ELF headers
+            self.lib_name_hits = sorted(
+                (pos, name) for name in self.LIB_NAMES for pos in self.hits.get(name, []))
+            self.lib_name_offsets = [pos for pos, _ in self.lib_name_hits]
+        return self.hits
+
     def find_all_partitions(self):
         """Find all partition offsets in the image."""
         partitions = []
-        offset = 0
-
-        while offset < len(self.data) - 16:
-            # Android boot image
-            if self.data[offset:offset+8] == self.MAGIC_ANDROID_BOOT:
-                size = self._get_boot_img_size(offset)
-                partitions.append({
-                    'type': 'boot.img',
-                    'offset': offset,
-                    'size': size
-                })
-                print(f"  Found boot.img at 0x{offset:08x} ({size:,} bytes)")
-
-            # Sparse image (system, vendor, etc.)
-            elif self.data[offset:offset+4] == self.MAGIC_SPARSE:
-                size = self._get_sparse_size(offset)
-                partitions.append({
-                    'type': 'sparse',
-                    'offset': offset,
-                    'size': size
-                })
-                print(f"  Found sparse image at 0x{offset:08x} ({size:,} bytes)")
-
-            # GZIP compressed
-            elif self.data[offset:offset+2] == self.MAGIC_GZIP:
-                partitions.append({
-                    'type': 'gzip',
-                    'offset': offset,
-                    'size': 0  # Unknown until decompressed
-                })
-
-            offset += 512  # Scan every 512 bytes
+        hits = self.scan_signatures()
+        limit = len(self.data) - 16
 
+        # Android boot image
+        for offset in hits.get(self.MAGIC_ANDROID_BOOT, []):
+            if offset >= limit:
+                break
+            if not _is_boot_header(self.data, offset):
+                continue
+            size = self._get_boot_img_size(offset)
+            partitions.append({
+                'type': 'boot.img',
+                'offset': offset,
+                'size': size
+            })
+            print(f"  Found boot.img at 0x{offset:08x} ({size:,} bytes)")
+
+        # Sparse image (system, vendor, etc.)
+        for offset in hits.get(self.MAGIC_SPARSE, []):
+            if offset >= limit:
+                break
+            size = self._get_sparse_size(offset)
+            partitions.append({
+                'type': 'sparse',
+                'offset': offset,
+                'size': size
+            })
+            print(f"  Found sparse image at 0x{offset:08x} ({size:,} bytes)")
+
+        # GZIP compressed
+        for offset in hits.get(self.MAGIC_GZIP_DEFLATE, []):
+            if offset >= limit:
+                break
+            partitions.append({
+                'type': 'gzip',
+                'offset': offset,
+                'size': 0  # Unknown until decompressed
+            })
+
+        partitions.sort(key=lambda p: p['offset'])
         return partitions
 
+    @contextmanager
+    def _open_archive(self):
+        """Hold the output archive open for the duration of an extraction."""
+        if not self.archive:
+            yield
+            return
+        try:
+            with zipfile.ZipFile(self.output_dir / self.ARCHIVE_NAME, 'w',
+                                 zipfile.ZIP_STORED) as self.zip:
+                yield
+        finally:
+            self.zip = None
+
+    def _output_path(self, name):
+        """Path an output is reported under (inside the archive if enabled)."""
+        if self.zip is not None:
+            return self.output_dir / self.ARCHIVE_NAME / name
+        return self.output_dir / name
+
+    @contextmanager
+    def _open_output(self, name, mode='wb'):
+        """Open an output file for writing, as an archive member if enabled."""
+        if self.zip is None:
+            with open(self.output_dir / name, mode) as f:
+                yield f
+            return
+        # ZipFile only allows one member to be open for writing at a time
+        info = zipfile.ZipInfo(name, time.localtime()[:6])
+        with self._zip_lock, self.zip.open(info, 'w', force_zip64=True) as f:
+            if 'b' in mode:
+                yield f
+            else:
+                with io.TextIOWrapper(f) as text:
+                    yield text
+
+    def _write_range(self, name, offset, size):
+        """Write part of the image straight from the map, without a copy."""
+        with self._open_output(name) as f, memoryview(self.data) as view:
+            f.write(view[offset:offset+size])
+
     def _get_boot_img_size(self, offset):
         """Calculate Android boot image size."""
         try:
-            kernel_size = struct.unpack('<I', self.data[offset+8:offset+12])[0]
-            ramdisk_size = struct.unpack('<I', self.data[offset+16:offset+20])[0]
-            second_size = struct.unpack('<I', self.data[offset+24:offset+28])[0]
-            page_size = struct.unpack('<I', self.data[offset+36:offset+40])[0]
+            (kernel_size, _, ramdisk_size, _, second_size, _, _,
+             page_size) = _BOOT_HDR.unpack_from(self.data, offset + _BOOT_MAGIC_SIZE)
 
             if page_size == 0:
                 page_size = 2048
@@ -98,16 +354,16 @@ class AllwinnerImageExtractor:
         """Get sparse image size from header."""
         try:
             # Sparse header: magic(4) + version(4) + header_size(2) + chunk_header_size(2) + block_size(4) + total_blocks(4) + total_chunks(4)
-            total_blocks = struct.unpack('<I', self.data[offset+16:offset+20])[0]
-            block_size = struct.unpack('<I', self.data[offset+12:offset+16])[0]
+            _, _, block_size, total_blocks, _ = \
+                _SPARSE_HDR.unpack_from(self.data, offset + _SPARSE_HDR_OFFSET)
             return min(total_blocks * block_size, 1024 * 1024 * 1024)  # Max 1GB
         except:
             return 512 * 1024 * 1024  # Default 512MB
 
     def extract_libs_from_data(self):
         """Extract .so libraries directly from image data."""
-        libs_dir = self.output_dir / 'extracted_libs'
-        libs_dir.mkdir(parents=True, exist_ok=True)
+        if self.zip is None:
+            (self.output_dir / 'extracted_libs').mkdir(parents=True, exist_ok=True)
 
         # Known library signatures and names
         lib_patterns = [
@@ -125,72 +381,66 @@ class AllwinnerImageExtractor:
         ]
 
         # Find ELF files
-        elf_magic = b'\x7fELF'
-        offset = 0
+        next_offset = 0
         elf_count = 0
 
-        print("\n=== Searching for ELF libraries ===")
-
-        while offset < len(self.data) - 100:
-            if self.data[offset:offset+4] == elf_magic:
-                # Check if it's a shared library (ET_DYN = 3)
-                elf_type = struct.unpack('<H', self.data[offset+16:offset+18])[0]
-                if elf_type == 3:  # Shared object
-                    # Try to find the library name
-                    lib_name = self._find_lib_name(offset)
-                    if lib_name and any(pattern in lib_name for pattern in
-                        [b'mali', b'Mali', b'cedar', b'gralloc', b'hwcomposer', b'VE', b'UMP', b'sun8i']):
+        _log("\n=== Searching for ELF libraries ===")
 
-                        # Estimate size (look for next ELF or reasonable boundary)
-                        size = self._estimate_elf_size(offset)
+        limit = len(self.data) - 100
 
-                        lib_name_str = lib_name.decode('ascii', errors='ignore').strip('\x00')
-                        output_path = libs_dir / lib_name_str
-
-                        print(f"  Found: {lib_name_str} at 0x{offset:08x} (~{size:,} bytes)")
+        for offset in self.scan_signatures().get(self.MAGIC_ELF, []):
+            if offset >= limit:
+                break
+            # Skip ELF headers embedded in a library already extracted
+            if offset < next_offset:
+                continue
+
+            # Check if it's a shared library (ET_DYN = 3)
+            elf_type = _U16(self.data, offset + 16)[0]
+            if elf_type == 3:  # Shared object
+                # Try to find the library name
+                lib_name = self._find_lib_name(offset)
+                if lib_name and any(pattern in lib_name for pattern in
+                    [b'mali', b'Mali', b'cedar', b'gralloc', b'hwcomposer', b'VE', b'UMP', b'sun8i']):
+
+                    # Estimate size (look for next ELF or reasonable boundary)
+                    size = self._estimate_elf_size(offset)
+
+                    lib_name_str = lib_name.decode('ascii', errors='ignore').strip('\x00')
+                    # Archive members cannot be moved afterwards, so they go
+                    # straight to their vendor_blobs location
+                    if self.zip is None:
+                        output_name = f'extracted_libs/{lib_name_str}'
+                    else:
+                        output_name = f'vendor_blobs/{self._vendor_lib_dir(lib_name_str)}/{lib_name_str}'
 
-                        with open(output_path, 'wb') as f:
-                            f.write(self.data[offset:offset+size])
+                    _log(f"  Found: {lib_name_str} at 0x{offset:08x} (~{size:,} bytes)")
 
-                        elf_count += 1
-                        offset += size
-                        continue
+                    self._write_range(output_name, offset, size)
 
-            offset += 4
+                    elf_count += 1
+                    next_offset = offset + size
 
-        print(f"\nExtracted {elf_count} libraries")
+        _log(f"\nExtracted {elf_count} libraries")
         return elf_count
 
     def _find_lib_name(self, offset):
         """Try to find library name near ELF header."""
-        # Search in a window after the ELF header for .so names
-        search_window = self.data[offset:offset+10000]
-
-        # Look for common patterns
-        patterns = [
-            b'libGLES_mali.so',
-            b'libMali.so',
-            b'libUMP.so',
-            b'gralloc.sun8i.so',
-            b'gralloc.sun50i.so',
-            b'hwcomposer.sun8i.so',
-            b'hwcomposer.sun50i.so',
-            b'libcedarc.so',
-            b'libcedarx.so',
-            b'libcdc_base.so',
-            b'libcdc_vd_h264.so',
-            b'libcdc_vd_h265.so',
-            b'libcdc_vd_mpeg2.so',
-            b'libcdc_vd_mpeg4.so',
-            b'libVE.so',
-            b'libMemAdapter.so',
-            b'libvdecoder.so',
-            b'libvencoder.so',
-            b'audio.primary.sun8i.so',
-        ]
+        # Names within the window after the ELF header, looked up from the
+        # signature scan; earlier LIB_NAMES entries win.
+        self.scan_signatures()
+        window_end = offset + 10000
+        found = set()
+
+        i = bisect_left(self.lib_name_offsets, offset)
+        while i < len(self.lib_name_offsets) and self.lib_name_offsets[i] < window_end:
+            pos, name = self.lib_name_hits[i]
+            if pos + len(name) <= window_end:
+                found.add(name)
+            i += 1
 
-        for pattern in patterns:
-            if pattern in search_window:
+        for pattern in self.LIB_NAMES:
+            if pattern in found:
                 return pattern
 
         return None
@@ -202,13 +452,11 @@ class AllwinnerImageExtractor:
             is_64bit = self.data[offset+4] == 2
 
             if is_64bit:
-                sh_offset = struct.unpack('<Q', self.data[offset+40:offset+48])[0]
-                sh_entsize = struct.unpack('<H', self.data[offset+58:offset+60])[0]
-                sh_num = struct.unpack('<H', self.data[offset+60:offset+62])[0]
+                sh_offset, sh_entsize, sh_num = \
+                    _ELF64_SH.unpack_from(self.data, offset + _ELF64_SH_OFFSET)
             else:
-                sh_offset = struct.unpack('<I', self.data[offset+32:offset+36])[0]
-                sh_entsize = struct.unpack('<H', self.data[offset+46:offset+48])[0]
-                sh_num = struct.unpack('<H', self.data[offset+48:offset+50])[0]
+                sh_offset, sh_entsize, sh_num = \
+                    _ELF32_SH.unpack_from(self.data, offset + _ELF32_SH_OFFSET)
 
             size = sh_offset + (sh_entsize * sh_num)
 
@@ -223,21 +471,21 @@ class AllwinnerImageExtractor:
     def extract_firmware(self):
         """Extract WiFi/BT firmware files."""
         fw_dir = self.output_dir / 'firmware'
-        fw_dir.mkdir(parents=True, exist_ok=True)
+        if self.zip is None:
+            fw_dir.mkdir(parents=True, exist_ok=True)
 
-        print("\n=== Searching for firmware files ===")
+        _log("\n=== Searching for firmware files ===")
 
-        # WiFi firmware patterns
-        fw_patterns = [
-            (b'xr829', 'xr829.bin'),
-            (b'rtl8189', 'rtl8189ftv_fw.bin'),
-            (b'rtl8723', 'rtl8723bs_fw.bin'),
-            (b'BCM4', 'bcm_wifi.bin'),
-            (b'brcmfmac', 'brcmfmac.bin'),
-        ]
+        # First occurrence of every firmware pattern, from a single pass
+        # that stops once all of them have been seen
+        first_seen = {}
+        for pos, pattern in self.FIRMWARE_SCANNER.finditer(self.data):
+            first_seen.setdefault(pattern, pos)
+            if len(first_seen) == len(self.FIRMWARE_PATTERNS):
+                break
 
-        for pattern, name in fw_patterns:
-            pos = self.data.find(pattern)
+        for pattern, name in self.FIRMWARE_PATTERNS:
+            pos = first_seen.get(pattern, -1)
             if pos != -1:
                 # Extract a chunk around the pattern
                 start = max(0, pos - 1024)
@@ -245,82 +493,78 @@ class AllwinnerImageExtractor:
                 end = min(len(self.data), pos + 256 * 1024)
 
                 output_path = fw_dir / name
-                print(f"  Found {name} pattern at 0x{pos:08x}")
+                _log(f"  Found {name} pattern at 0x{pos:08x}")
 
                 # Note: This is approximate - real firmware extraction needs more analysis
 
     def extract_fex_configs(self):
         """Extract all FEX configuration files."""
-        fex_dir = self.output_dir / 'fex'
-        fex_dir.mkdir(parents=True, exist_ok=True)
+        if self.zip is None:
+            (self.output_dir / 'fex').mkdir(parents=True, exist_ok=True)
 
-        print("\n=== Extracting FEX configurations ===")
+        _log("\n=== Extracting FEX configurations ===")
 
-        markers = [b'[product]', b'[platform]', b'[target]']
-        found = set()
+        configs = []
+        # Each marker is only searched again past the end of the config it
+        # last produced, as when the markers were scanned one at a time.
+        next_offset = {}
 
-        for marker in markers:
-            offset = 0
-            while True:
-                pos = self.data.find(marker, offset)
-                if pos == -1:
-                    break
-
-                if pos in found:
-                    offset = pos + 1
-                    continue
-
-                found.add(pos)
-
-                # Find end of config
-                end = pos
-                null_count = 0
-                while end < len(self.data) and end - pos < 100000:
-                    if self.data[end] == 0:
-                        null_count += 1
-                        if null_count > 10:
-                            break
-                    else:
-                        null_count = 0
-                    end += 1
+        for match in self.FEX_MARKERS.finditer(self.data):
+            pos = match.start()
+            if pos < next_offset.get(match.group(), 0):
+                continue
+
+            # Find end of config: the 11th byte of the first run of nulls
+            limit = min(len(self.data), pos + 100000)
+            end = self.data.find(b'\x00' * 11, pos, limit)
+            end = limit if end == -1 else end + 10
 
-                if end - pos > 500:  # Minimum valid config
-                    config_data = self.data[pos:end]
-                    # Clean nulls
-                    config_data = config_data.replace(b'\x00', b'')
+            configs.append((self.FEX_MARKER_ORDER.index(match.group()), pos, end))
+            next_offset[match.group()] = end
 
-                    output_path = fex_dir / f'sys_config_{len(found)-1}.fex'
-                    with open(output_path, 'wb') as f:
-                        f.write(config_data)
-                    print(f"  Saved: {output_path.name} ({len(config_data)} bytes)")
+        # Every candidate takes a number, including ones too short to save
+        for index, (_, pos, end) in enumerate(sorted(configs)):
+            if end - pos > 500:  # Minimum valid config
+                config_data = self.data[pos:end]
+                # Clean nulls
+                config_data = config_data.replace(b'\x00', b'')
 
-                offset = end
+                output_name = f'sys_config_{index}.fex'
+                with self._open_output(f'fex/{output_name}') as f:
+                    f.write(config_data)
+                _log(f"  Saved: {output_name} ({len(config_data)} bytes)")
 
     def extract_build_prop(self):
         """Extract build.prop file."""
-        print("\n=== Extracting build.prop ===")
+        _log("\n=== Extracting build.prop ===")
 
         start = self.data.find(b'ro.build.id=')
         if start == -1:
-            print("  build.prop not found")
+            _log("  build.prop not found")
             return
 
-        # Find reasonable end
-        end = start
-        while end < len(self.data) and end - start < 20000:
-            # Look for double null or non-printable sequences
-            if self.data[end:end+4] == b'\x00\x00\x00\x00':
-                break
-            end += 1
+        # Find reasonable end: first run of four nulls within 20000 bytes
+        limit = min(len(self.data), start + 20000)
+        end = self.data.find(b'\x00\x00\x00\x00', start, limit + 3)
+        if end == -1:
+            end = limit
 
         prop_data = self.data[start:end]
         # Clean up
         prop_data = prop_data.replace(b'\x00', b'\n')
 
-        output_path = self.output_dir / 'build.prop'
-        with open(output_path, 'wb') as f:
+        with self._open_output('build.prop') as f:
             f.write(prop_data)
-        print(f"  Saved: {output_path}")
+        _log(f"  Saved: {self._output_path('build.prop')}")
+
+    def _vendor_lib_dir(self, lib_name):
+        """vendor_blobs subdirectory a library belongs in."""
+        name = lib_name.lower()
+        if 'egl' in name or 'gles' in name:
+            return 'lib/egl'
+        if 'gralloc' in name or 'hwcomposer' in name or 'audio' in name:
+            return 'lib/hw'
+        return 'lib'
 
     def create_vendor_structure(self):
         """Create vendor directory structure with placeholders."""
@@ -348,52 +592,72 @@ class AllwinnerImageExtractor:
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
         self.read_image()
+        try:
+            with self._open_archive():
+                self._extract_all()
+        finally:
+            if isinstance(self.data, mmap.mmap):
+                self.data.close()
+
+        print("\n=== Extraction complete ===")
+        print(f"Output directory: {self.output_dir}")
 
+    def _extract_all(self):
+        """Extract everything from the mapped image."""
         print("\n=== Scanning for partitions ===")
         partitions = self.find_all_partitions()
 
         # Extract boot.img
         for part in partitions:
             if part['type'] == 'boot.img':
-                output_path = self.output_dir / 'boot.img'
-                with open(output_path, 'wb') as f:
-                    f.write(self.data[part['offset']:part['offset']+part['size']])
+                self._write_range('boot.img', part['offset'], part['size'])
                 print(f"  Extracted: boot.img")
                 break
 
-        self.extract_build_prop()
-        self.extract_fex_configs()
-        self.extract_libs_from_data()
-        self.extract_firmware()
+        # These only read the shared map and write to separate outputs, so
+        # run them side by side and let page faults and file I/O overlap.
+        if isinstance(self.data, mmap.mmap) and hasattr(mmap, 'MADV_WILLNEED'):
+            self.data.madvise(mmap.MADV_WILLNEED)
+        tasks = [
+            self.extract_build_prop,
+            self.extract_fex_configs,
+            self.extract_libs_from_data,
+            self.extract_firmware,
+        ]
+        # Each step's output is printed as one block, in task order, so
+        # sections never interleave however the workers are scheduled
+        with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+            for lines in pool.map(_run_buffered, tasks):
+                for args, kwargs in lines:
+                    print(*args, **kwargs)
+
+        if self.zip is not None:
+            # Libraries were already written under vendor_blobs/
+            return
+
         vendor_dir = self.create_vendor_structure()
 
         # Move extracted libs to vendor structure
         libs_dir = self.output_dir / 'extracted_libs'
         if libs_dir.exists():
             for lib in libs_dir.glob('*.so'):
-                if 'egl' in lib.name.lower() or 'gles' in lib.name.lower():
-                    dest = vendor_dir / 'lib/egl' / lib.name
-                elif 'gralloc' in lib.name.lower() or 'hwcomposer' in lib.name.lower() or 'audio' in lib.name.lower():
-                    dest = vendor_dir / 'lib/hw' / lib.name
-                else:
-                    dest = vendor_dir / 'lib' / lib.name
+                dest = vendor_dir / self._vendor_lib_dir(lib.name) / lib.name
 
                 lib.rename(dest)
                 print(f"  Moved: {lib.name} -> {dest.relative_to(self.output_dir)}")
 
-        print("\n=== Extraction complete ===")
-        print(f"Output directory: {self.output_dir}")
-
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: extract_allwinner_image.py <image.img> [output_dir]")
+    args = [arg for arg in sys.argv[1:] if arg != '--zip']
+    if len(args) < 1:
+        print("Usage: extract_allwinner_image.py [--zip] <image.img> [output_dir]")
+        print("With --zip, outputs are stored in output_dir/extracted.zip.")
         sys.exit(1)
 
-    image_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else './extracted_full'
+    image_path = args[0]
+    output_dir = args[1] if len(args) > 1 else './extracted_full'
 
-    extractor = AllwinnerImageExtractor(image_path, output_dir)
+    extractor = AllwinnerImageExtractor(image_path, output_dir, archive='--zip' in sys.argv[1:])
     extractor.run()
 
 